@@ -593,7 +593,11 @@ class BibDataBase(object):
 
     def load_pub2year(self):
 
-        if os.path.exists(os.path.join(self.path2database, 'pub2year.json.gz')):
+        if os.path.exists(os.path.join(self.path2database, 'pub2year.parquet')):
+            pub2year = pd.read_parquet(os.path.join(self.path2database, 'pub2year.parquet'))
+            return dict(zip(pub2year['PublicationId'].astype(self.PublicationIdType).tolist(), pub2year['Year'].astype(int).tolist()))
+
+        elif os.path.exists(os.path.join(self.path2database, 'pub2year.json.gz')):
             with gzip.open(os.path.join(self.path2database, 'pub2year.json.gz'), 'r') as infile:
                 pub2year = json.loads(infile.read().decode('utf8'))
             return {self.PublicationIdType(k):int(y) for k,y in pub2year.items() if not y is None}
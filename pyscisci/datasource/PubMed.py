@@ -1,11 +1,16 @@
 import os
 import sys
+import gc
 import json
 import gzip
 import glob
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from nameparser import HumanName
 import requests
 import ftplib
@@ -22,6 +27,452 @@ else:
 from pyscisci.datasource.readwrite import load_preprocessed_data, load_int, load_float, load_html_str, load_xml_text
 from pyscisci.database import BibDataBase
 
+
+class _LocalDTDResolver(etree.Resolver):
+    """
+    Resolve the dtd referenced by the PubMed xml files to the copy saved next to them.
+
+    The files point at the dtd on dtd.nlm.nih.gov; when a file with the same name exists in the
+    local directory (as saved by download_from_source), it is used instead.
+    """
+
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+
+    def resolve(self, url, pubid, context):
+        local_file_name = os.path.join(self.directory, os.path.basename(url))
+        if os.path.isfile(local_file_name):
+            return self.resolve_filename(local_file_name, context)
+        return None
+
+def _iterparse_pubmed_articles(xml_path):
+    """
+    Stream the PubmedArticle elements from a PubMed xml file (optionally gzipped).
+
+    Each article is cleared, along with its already processed siblings, once the caller moves on
+    to the next one, so only a single article subtree is held in memory at a time.
+    """
+    if xml_path.endswith('.gz'):
+        infile = gzip.open(xml_path, 'rb')
+    else:
+        infile = open(xml_path, 'rb')
+
+    with infile:
+        # only the element structure is needed: blank text and xml ids are not kept, and the dtd
+        # is loaded for its entities from the local copy, never over the network
+        context = etree.iterparse(infile, tag="PubmedArticle", load_dtd=True, resolve_entities=True, no_network=True,
+            dtd_validation=False, remove_blank_text=True, collect_ids=False, huge_tree=True)
+        context.resolvers.add(_LocalDTDResolver(os.path.dirname(os.path.abspath(xml_path))))
+        for _, article_bucket in context:
+            yield article_bucket
+
+            article_bucket.clear()
+            while article_bucket.getprevious() is not None:
+                del article_bucket.getparent()[0]
+
+# precompiled paths for the repeated lookups into each article
+_XP_PUBDATE = etree.XPath("PubmedData/History/PubMedPubDate[1]", smart_strings=False)
+_XP_DOI = etree.XPath('PubmedData/ArticleIdList/ArticleId[@IdType="doi"]', smart_strings=False)
+_XP_VOLUME = etree.XPath("JournalIssue/Volume", smart_strings=False)
+_XP_ISSUE = etree.XPath("JournalIssue/Issue", smart_strings=False)
+_XP_AUTHORS = etree.XPath("AuthorList/Author", smart_strings=False)
+_XP_AFFILIATION = etree.XPath("AffiliationInfo/Affiliation", smart_strings=False)
+_XP_DESCRIPTORS = etree.XPath("MeshHeading/DescriptorName[@UI]", smart_strings=False)
+_XP_SUBSTANCES = etree.XPath("Chemical/NameOfSubstance[@UI]", smart_strings=False)
+_XP_REFERENCES = etree.XPath("PubmedData/ReferenceList/Reference", smart_strings=False)
+_XP_REF_PMID = etree.XPath('ArticleIdList/ArticleId[@IdType="pubmed"]', smart_strings=False)
+
+def _xpath_first(xpath, element):
+    found = xpath(element)
+    if len(found) > 0:
+        return found[0]
+    return None
+
+# column name and dtype of each of the DataFrames
+_PUB_COLUMNS = {'PublicationId':np.int64, 'Title':object, 'Year':object, 'Volume':object, 'Issue':object, 'Pages':object,
+    'JournalId':object, 'TeamSize':np.int64, 'Month':object, 'Day':object, 'ISSN':object, 'Doi':object}
+
+# these publication columns are collected as raw text and converted to integers once per file
+_PUB_INT_DEFAULTS = {'Year':0, 'Volume':0, 'Issue':0, 'Month':1, 'Day':1}
+
+_PAA_COLUMNS = {'PublicationId':np.int64, 'FullName':object, 'FirstName':object, 'LastName':object, 'Affiliations':object,
+    'AuthorSequence':np.int64}
+
+_PUB2FIELD_COLUMNS = {'PublicationId':np.int64, 'FieldId':object}
+
+# the cited PublicationId is missing for references without a pubmed id, so it is stored as a float,
+# and the citation text is loaded into arrow string buffers
+_PUB2REF_COLUMNS = {'CitingPublicationId':np.int64, 'CitedPublicationId':np.float64, 'Citation':pd.StringDtype('pyarrow')}
+
+# placeholder text found in place of the affiliations of large author lists
+_AFF_BOILERPLATE = "For a full list of the authors' affiliations please see the Acknowledgements section."
+
+def _empty_columns(column_types, size=4096):
+    # the strings are collected as python objects, whatever dtype they are loaded with
+    return {col:np.empty(size, dtype=object if isinstance(coltype, pd.StringDtype) else coltype)
+        for col, coltype in column_types.items()}
+
+def _arrow_schema(column_types):
+    """
+    The arrow schema of a DataFrame, with the pandas metadata that restores its dtypes when the file is read.
+
+    pandas records every string dtype as 'string', so the storage of the arrow backed columns is named
+    explicitly; pd.read_parquet and to_pandas then build these columns straight from the arrow buffers.
+    """
+    schema = pa.schema([(col, pa.string() if coltype is object or isinstance(coltype, pd.StringDtype) else pa.from_numpy_dtype(coltype))
+        for col, coltype in column_types.items()])
+    empty_df = pd.DataFrame({col:pd.Series(dtype=coltype) for col, coltype in column_types.items()})
+    schema = pa.Table.from_pandas(empty_df, schema=schema, preserve_index=False).schema
+
+    pandas_metadata = schema.pandas_metadata
+    for column in pandas_metadata['columns']:
+        if isinstance(column_types[column['name']], pd.StringDtype):
+            column['numpy_type'] = 'string[{}]'.format(column_types[column['name']].storage)
+    return schema.with_metadata({b'pandas':json.dumps(pandas_metadata).encode('utf8')})
+
+def _grow_columns(columns):
+    """
+    Double the length of every array in the columns dict, keeping the values already written.
+    """
+    for col, arr in columns.items():
+        newarr = np.empty(2*arr.shape[0], dtype=arr.dtype)
+        newarr[:arr.shape[0]] = arr
+        columns[col] = newarr
+
+def _download_ftp_files(source_url, ftp_directory, file_names, dest_directory, pbar=None):
+    """
+    Download the files over a single anonymous ftp session.
+
+    Each file is written under a temporary name and only renamed once complete, so an interrupted
+    download is not mistaken for a finished one.
+    """
+    ftp = ftplib.FTP(source_url, "anonymous", "")
+    ftp.encoding = "utf-8"
+    ftp.cwd(ftp_directory)
+
+    for file_name in file_names:
+        dest_file_name = os.path.join(dest_directory, file_name)
+        with open(dest_file_name + '.part', "wb") as outfile:
+            ftp.retrbinary('RETR %s' % file_name, outfile.write, blocksize=2**20)
+        os.replace(dest_file_name + '.part', dest_file_name)
+
+        if not pbar is None:
+            pbar.update(1)
+
+    ftp.quit()
+
+def _concat_hdf_files(file_list, desc='PubMed files', show_progress=True):
+    """
+    Read the hdf files and concatenate them into a single DataFrame, allocating the result once.
+    """
+    if len(file_list) == 0:
+        return pd.DataFrame()
+
+    # materialize each table into its own contiguous blocks, otherwise concat falls back to
+    # ravel copies of the frames read from the hdf tables
+    return pd.concat((pd.read_hdf(fname).copy() for fname in tqdm(file_list, desc=desc, leave=True, disable=not show_progress)),
+        ignore_index=True, copy=False)
+
+def _concat_parquet_files(file_list, column_types, desc='PubMed files', show_progress=True):
+    """
+    Read the parquet files and concatenate them into a single DataFrame.
+
+    Arrow keeps the files as chunks of one table and converts them to pandas in a single pass.
+    """
+    if len(file_list) == 0:
+        return _arrow_schema(column_types).empty_table().to_pandas()
+
+    return pa.concat_tables([pq.read_table(fname) for fname in tqdm(file_list, desc=desc, leave=True,
+        disable=not show_progress)]).to_pandas()
+
+def _parse_ints(strs, default=0):
+    """
+    Convert an array of integer strings to int64 in one pass.
+
+    Plain digit strings short enough to always fit an int64 are cast by arrow's compute kernels; only
+    the remaining entries go through load_int.  Missing, malformed, and zero values are replaced by
+    the default.
+    """
+    out = np.full(len(strs), default, dtype=np.int64)
+    if len(strs) == 0:
+        return out
+
+    text = pa.array(strs, type=pa.string())
+    isdigit = pc.and_(pc.ascii_is_decimal(text), pc.less_equal(pc.utf8_length(text), 18))
+    isdigit = pc.fill_null(isdigit, False).to_numpy(zero_copy_only=False)
+    out[isdigit] = pc.cast(pc.filter(text, isdigit), pa.int64()).to_numpy(zero_copy_only=False)
+
+    for i in np.flatnonzero(~isdigit):
+        if strs[i]:
+            value = load_int(strs[i])
+            # values beyond the int64 range are as unusable as malformed ones
+            if value and -2**63 <= value < 2**63:
+                out[i] = value
+
+    if default != 0:
+        out[out == 0] = default
+    return out
+
+def _write_hdf(df, dest_file_name, key, chunksize=2**16, data_columns=None):
+    """
+    Save the DataFrame as a compressed, chunked hdf table.
+
+    The rows are written `chunksize` at a time and the expected number of rows lets PyTables pick
+    chunks large enough for the zstd compression and later sequential reads.
+    """
+    with pd.HDFStore(dest_file_name, mode='w', complib='blosc:zstd', complevel=3) as store:
+        if df.shape[0] == 0:
+            # appending an empty frame writes nothing, so store it in the fixed format instead
+            store.put(key, df)
+        else:
+            store.append(key, df, format='table', chunksize=chunksize, expectedrows=df.shape[0], data_columns=data_columns)
+
+class _ParquetTableStream(object):
+    """
+    Stream rows into a parquet file, one row group per batch.
+
+    The rows are collected in typed column buffers of `batch_size` rows, and the buffers are written
+    out each time they fill, so only a single batch is held in memory.  The string columns are stored
+    with their full length.
+    """
+
+    def __init__(self, dest_file_name, column_types, batch_size=2**16, compression='snappy'):
+        self.columns = _empty_columns(column_types, batch_size)
+        self.batch_size = batch_size
+        self.nrows = 0
+
+        self.schema = _arrow_schema(column_types)
+
+        self.store = pq.ParquetWriter(dest_file_name, self.schema, compression=compression)
+
+    def append(self, row):
+        if self.nrows == self.batch_size:
+            self.flush()
+
+        for arr, value in zip(self.columns.values(), row):
+            arr[self.nrows] = value
+        self.nrows += 1
+
+    def extend(self, nrows, *values):
+        """
+        Append `nrows` rows given column by column, where each value is either a sequence of `nrows`
+        entries or a single entry shared by every row.
+        """
+        start = 0
+        while start < nrows:
+            if self.nrows == self.batch_size:
+                self.flush()
+
+            stop = min(nrows, start + self.batch_size - self.nrows)
+            for arr, value in zip(self.columns.values(), values):
+                if isinstance(value, (list, tuple)):
+                    arr[self.nrows:self.nrows + stop - start] = value[start:stop]
+                else:
+                    arr[self.nrows:self.nrows + stop - start] = value
+            self.nrows += stop - start
+            start = stop
+
+    def flush(self):
+        if self.nrows > 0:
+            self._write_batch({col:arr[:self.nrows] for col, arr in self.columns.items()})
+        self.nrows = 0
+
+    def _write_batch(self, batch):
+        self.store.write_table(pa.Table.from_pydict(batch, schema=self.schema))
+
+    def close(self):
+        self.flush()
+        # the writer always leaves a valid (possibly empty) file with the schema
+        self.store.close()
+
+def _extract_article(article_bucket, fieldinfo):
+    """
+    Extract the publication, author, field, and reference rows from a single PubmedArticle.
+
+    The children of the MedlineCitation and Article elements are visited once and dispatched on
+    their tag, instead of being searched for one at a time.  Field ids not yet in the fieldinfo
+    dict are added to it with their (name, type).
+
+    Returns
+    -------
+    tuple
+        (pub_row, author_rows, field_ids, ref_columns) where the publication and author rows are
+        ordered as the columns of their DataFrames, field_ids lists the article's field ids, and
+        ref_columns holds the lists of cited PublicationIds and Citation texts.
+    """
+    medline = article_bucket.find("MedlineCitation")
+
+    pmid = article = meshterms = chemicals = None
+    for child in medline:
+        if child.tag == 'PMID':
+            pmid = child
+        elif child.tag == 'Article':
+            article = child
+        elif child.tag == 'MeshHeadingList':
+            meshterms = child
+        elif child.tag == 'ChemicalList':
+            chemicals = child
+
+    title = pagination = journal = None
+    for child in article:
+        if child.tag == 'ArticleTitle':
+            title = child
+        elif child.tag == 'Pagination':
+            pagination = child
+        elif child.tag == 'Journal':
+            journal = child
+
+    # scrape the publication information
+    PublicationId = load_int(load_xml_text(pmid))
+
+    if pagination is None:
+        pages = None
+    else:
+        pages = load_html_str(load_xml_text(pagination.find("MedlinePgn")))
+
+    year, month, day = '', '', ''
+    pdate = _xpath_first(_XP_PUBDATE, article_bucket)
+    if not pdate is None:
+        year = load_xml_text(pdate.find("Year"))
+        month = load_xml_text(pdate.find("Month"))
+        day = load_xml_text(pdate.find("Day"))
+
+    author_rows = []
+    authors = _XP_AUTHORS(article)
+    for seq, author in enumerate(authors):
+        first_name = load_html_str(load_xml_text(author.find("ForeName")))
+        last_name = load_html_str(load_xml_text(author.find("LastName")))
+
+        affiliations = ''
+        affiliation = _xpath_first(_XP_AFFILIATION, author)
+        if affiliation is not None:
+            affiliations = load_html_str(load_xml_text(affiliation))
+            if _AFF_BOILERPLATE in affiliations:
+                affiliations = affiliations.replace(_AFF_BOILERPLATE, "")
+
+        author_rows.append((PublicationId, first_name + ' ' + last_name, first_name, last_name, affiliations, seq+1))
+
+    pub_row = (PublicationId,
+        load_html_str(load_xml_text(title)),
+        year,
+        load_xml_text(_xpath_first(_XP_VOLUME, journal)),
+        load_xml_text(_xpath_first(_XP_ISSUE, journal)),
+        pages,
+        load_html_str(load_xml_text(journal.find("Title"))),
+        len(authors),
+        month,
+        day,
+        load_html_str(load_xml_text(journal.find("ISSN"))),
+        load_xml_text(_xpath_first(_XP_DOI, article_bucket)))
+
+    # the field ids repeat across most articles, so they are interned to let every buffered
+    # pub2field row share one string per field
+    field_ids = []
+    if meshterms is not None:
+        for descriptor in _XP_DESCRIPTORS(meshterms):
+            ui = sys.intern(descriptor.get("UI"))
+            if len(ui)>0:
+                field_ids.append(ui)
+                if not ui in fieldinfo:
+                    fieldinfo[ui] = (load_xml_text(descriptor), 'mesh')
+
+    if chemicals is not None:
+        for substance in _XP_SUBSTANCES(chemicals):
+            ui = sys.intern(substance.get("UI"))
+            if len(ui)>0:
+                field_ids.append(ui)
+                if not ui in fieldinfo:
+                    fieldinfo[ui] = (load_xml_text(substance), 'chem')
+
+    ref_pmids, citations = [], []
+    for ref in _XP_REFERENCES(article_bucket):
+        citations.append(load_xml_text(ref.find("Citation")))
+        ref_pmids.append(load_int(load_xml_text(_xpath_first(_XP_REF_PMID, ref))))
+
+    return pub_row, author_rows, field_ids, (ref_pmids, citations)
+
+def _process_one_xml(args):
+    """
+    Parse a single PubMed xml file and save its DataFrames.
+
+    This lives at the module level so the files can be dispatched to a pool of worker processes.
+
+    Parameters
+    ----------
+    :param args : tuple
+        (ifile, xml_path, dest_files) where dest_files is a dict mapping each of 'pub', 'paa', 'pub2field',
+        and 'pub2ref' to the file that DataFrame is saved to (hdf for pub, parquet otherwise).
+
+    Returns
+    -------
+    tuple
+        (ifile, pub2year, fieldinfo) for the articles found in the file.
+    """
+    ifile, xml_path, dest_files = args
+
+    # the DataFrames are written under temporary names and only renamed once the whole file is parsed,
+    # so a worker stopped part way through does not leave files that look finished
+    part_files = {dftype:dest_file_name + '.part' for dftype, dest_file_name in dest_files.items()}
+
+    fieldinfo = {}
+
+    # the publication information is written directly into typed column arrays
+    pub_arrays = _empty_columns(_PUB_COLUMNS)
+    npubs = 0
+
+    # while the author, field, and reference rows are streamed to their parquet files, which keep
+    # the affiliation and citation texts at their full length
+    paa_table = _ParquetTableStream(part_files['paa'], _PAA_COLUMNS)
+    pub2field_table = _ParquetTableStream(part_files['pub2field'], _PUB2FIELD_COLUMNS)
+    pub2ref_table = _ParquetTableStream(part_files['pub2ref'], _PUB2REF_COLUMNS)
+
+    all_pubmed_articles = _iterparse_pubmed_articles(xml_path)
+
+    # the per-article loop only creates short lived objects, so the cyclic garbage collector is
+    # paused while it runs and collects once at the end of the file
+    gc.disable()
+    try:
+        for article_bucket in all_pubmed_articles:
+
+            pub_row, author_rows, field_ids, (ref_pmids, citations) = _extract_article(article_bucket, fieldinfo)
+
+            if npubs == pub_arrays['PublicationId'].shape[0]:
+                _grow_columns(pub_arrays)
+
+            for arr, value in zip(pub_arrays.values(), pub_row):
+                arr[npubs] = value
+            npubs += 1
+
+            for author_row in author_rows:
+                paa_table.append(author_row)
+
+            # pub_row[0] is the PublicationId, shared by all of the field and reference rows
+            pub2field_table.extend(len(field_ids), pub_row[0], field_ids)
+            pub2ref_table.extend(len(ref_pmids), pub_row[0], ref_pmids, citations)
+    finally:
+        gc.enable()
+        gc.collect()
+
+    paa_table.close()
+    pub2field_table.close()
+    pub2ref_table.close()
+
+    pub_arrays = {col:arr[:npubs] for col, arr in pub_arrays.items()}
+    for col, default in _PUB_INT_DEFAULTS.items():
+        pub_arrays[col] = _parse_ints(pub_arrays[col], default)
+
+    hasyear = pub_arrays['Year'] > 0
+    pub2year = dict(zip(pub_arrays['PublicationId'][hasyear].tolist(), pub_arrays['Year'][hasyear].tolist()))
+
+    publication_df = pd.DataFrame(pub_arrays, copy=False)
+    _write_hdf(publication_df, part_files['pub'], key = 'pub', data_columns=['PublicationId', 'Year'])
+
+    for dftype, dest_file_name in dest_files.items():
+        os.replace(part_files[dftype], dest_file_name)
+
+    return ifile, pub2year, fieldinfo
+
 class PubMed(BibDataBase):
     """
     Base class for PubMed Medline interface.
@@ -43,224 +494,148 @@ class PubMed(BibDataBase):
         self.AffiliationIdType = int
         self.AuthorIdType = str
 
+    def _dest_files(self, ifile):
+        return {'pub':os.path.join(self.path2database, self.path2pub_df, 'publication{}.hdf'.format(ifile)),
+            'paa':os.path.join(self.path2database, self.path2paa_df, 'publicationauthoraffiliation{}.parquet'.format(ifile)),
+            'pub2field':os.path.join(self.path2database, self.path2pub2field_df, 'pub2field{}.parquet'.format(ifile)),
+            'pub2ref':os.path.join(self.path2database, self.path2pub2ref_df, 'pub2ref{}.parquet'.format(ifile))}
 
-    def _blank_pubmed_publication(self, PublicationId = 0):
-        record = {}
-        record['PublicationId'] = PublicationId
-        record['Title'] = ''
-        record['Year'] = 0
-        record['Volume'] = 0
-        record['Issue'] = ''
-        record['Pages'] = ''
-        record['JournalId'] = ''
-        record['TeamSize'] = 0
-        record['Month'] = 1
-        record['Day'] = 1
-        record['ISSN'] = ''
-        record['Doi'] = ''
-
-        return record
-
-    def _blank_pubmed_author(self):
-        record = {}
-        record['PublicationId'] = ''
-        record['FullName'] = ''
-        record['FirstName'] = ''
-        record['LastName'] = ''
-        record['Affiliations'] = ''
-        record['AuthorSequence'] = 0
-        return record
-
-    def _save_dataframes(self, ifile, publication_df, paa_df, pub2ref_df, pub2field_df):
-
-        publication_df = pd.DataFrame(publication_df)
-        publication_df['PublicationId'] = publication_df['PublicationId'].astype(int)
-        publication_df['Year'] = publication_df['Year'].astype(int)
-        publication_df['Month'] = publication_df['Month'].astype(int)
-        publication_df['Day'] = publication_df['Day'].astype(int)
-        publication_df['Volume'] = pd.to_numeric(publication_df['Volume'])
-        publication_df['TeamSize'] = publication_df['TeamSize'].astype(int)
-        publication_df.to_hdf( os.path.join(self.path2database, self.path2pub_df, 'publication{}.hdf'.format(ifile)), key = 'pub', mode='w')
-
-
-        paa_df = pd.DataFrame(paa_df)
-        paa_df['AuthorSequence'] = paa_df['AuthorSequence'].astype(int)
-        paa_df.to_hdf( os.path.join(self.path2database, self.path2paa_df, 'publicationauthoraffiliation{}.hdf'.format(ifile)), key = 'paa', mode='w')
-
-        pub2field_df = pd.DataFrame(pub2field_df, columns = ['PublicationId', 'FieldId'], dtype=int)
-        pub2field_df.to_hdf( os.path.join(self.path2database, self.path2pub2field_df, 'pub2field{}.hdf'.format(ifile)), key = 'pub2field', mode='w')
-
-        pub2ref_df = pd.DataFrame(pub2ref_df, columns = ['CitedPublicationId', 'CitingPublicationId', 'Citation'], dtype=int)
-        pub2ref_df.to_hdf( os.path.join(self.path2database, self.path2pub2ref_df, 'pub2ref{}.hdf'.format(ifile)), key = 'pub2ref', mode='w')
-
-    def preprocess(self, xml_directory = 'RawXML', process_name=True, num_file_lines=10**6, show_progress=True,rewrite_existing = False):
+    def _xml_file_tasks(self, xml_directory, rewrite_existing=False):
         """
-        Bulk preprocess of the PubMed raw data.
+        List the PubMed xml files that still have to be parsed, as the task arguments of _process_one_xml.
 
-        Parameters
-        ----------
-        process_name: bool, default True
-            If True, then when processing the raw file, the package `NameParser <https://nameparser.readthedocs.io/en/latest/>`_
-            will be used to split author FullNames.
-
-        num_file_lines: int, default 10**6
-            The processed data will be saved into smaller DataFrames, each with `num_file_lines` rows.
-
-        show_progress: bool, default True
-            Show progress with processing of the data.
-
-        rewrite_existing: bool, default False
-            If True, rewrites the files in the data directory
+        Files whose DataFrames all already exist are skipped unless rewrite_existing is True.
         """
+        # the preprocessed DataFrames can also be used without the raw data
+        if not os.path.isdir(os.path.join(self.path2database, xml_directory)):
+            return []
 
-        if show_progress:
-            print("Starting to preprocess the PubMed database.")
-
-        for hier_dir_type in [self.path2pub_df, self.path2paa_df, self.path2pub2field_df, self.path2pub2ref_df, self.path2fieldinfo_df]:
-
-            if not os.path.exists(os.path.join(self.path2database, hier_dir_type)):
-                os.mkdir(os.path.join(self.path2database, hier_dir_type))
-
-
-        xmlfiles = sorted([fname for fname in os.listdir(os.path.join(self.path2database, xml_directory)) if '.xml' in fname])
+        xmlfiles = sorted([fname for fname in os.listdir(os.path.join(self.path2database, xml_directory)) if fname.endswith(('.xml', '.xml.gz'))])
 
-        # read dtd - this takes
-        path2database = self.path2database # remove self to use inside of this class
-        class DTDResolver(etree.Resolver):
-            def resolve(self, system_url, public_id, context):
-                return self.resolve_filename(os.path.join(path2database, system_url), context)
-        parser = etree.XMLParser(load_dtd=True, resolve_entities=True)
-
-        pub2year = {}
-        fieldinfo = {}
-
-        ifile = 0
-        for xml_file_name in tqdm(xmlfiles, desc='PubMed xml files', leave=True, disable=not show_progress):
+        tasks = []
+        for ifile, xml_file_name in enumerate(xmlfiles):
+            dest_files = self._dest_files(ifile)
 
             # check if the xml file was already parsed
-            dest_file_name = os.path.join(self.path2database, self.path2pub_df,'publication{}.hdf'.format(ifile))
-            if not rewrite_existing and os.path.isfile(dest_file_name):
-                ifile+=1
+            if not rewrite_existing and all(os.path.isfile(dest_file) for dest_file in dest_files.values()):
                 continue
 
-            publication_df = []
-            paa_df = []
-            pub2field_df = []
-            pub2ref_df = []
+            tasks.append((ifile, os.path.join(self.path2database, xml_directory, xml_file_name), dest_files))
 
-            xmltree = etree.parse(os.path.join(self.path2database, xml_directory, xml_file_name), parser)
+        return tasks
 
-            all_pubmed_articles = xmltree.findall("/PubmedArticle")
+    def _process_xml_files(self, tasks, num_workers=None, show_progress=True, desc='PubMed xml files'):
+        """
+        Parse the PubMed xml files in parallel, one file per worker process.
 
-            for article_bucket in all_pubmed_articles:
+        Returns
+        -------
+        tuple
+            (pub2year, fieldinfo) merged over all of the parsed files.
+        """
+        pub2year = {}
+        fieldinfo = {}
 
-                medline = article_bucket.find("MedlineCitation")
+        if len(tasks) == 0:
+            return pub2year, fieldinfo
 
-                # scrape the publication information
-                PublicationId = load_int(load_xml_text(medline.find('PMID')))
-                pub_record = self._blank_pubmed_publication(PublicationId)
+        # there is no point starting more processes than there are files left to parse
+        if num_workers is None:
+            num_workers = os.cpu_count()
+        num_workers = max(1, min(num_workers, len(tasks)))
 
-                article = medline.find("Article")
-                pub_record['Title'] = load_html_str(load_xml_text(article.find('ArticleTitle')))
-                if article.find('Pagination') == None:
-                    pub_record['Pages'] = None
-                else:
-                    pub_record['Pages'] = load_html_str(load_xml_text(article.find('Pagination').find("MedlinePgn")))
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            for ifile, file_pub2year, file_fieldinfo in tqdm(executor.map(_process_one_xml, tasks), total=len(tasks), desc=desc, leave=True, disable=not show_progress):
+                pub2year.update(file_pub2year)
+                for ui, info in file_fieldinfo.items():
+                    fieldinfo.setdefault(ui, info)
 
-                journal = article.find("Journal")
-                pub_record['JournalId'] = load_html_str(load_xml_text(journal.find("Title")))
-                pub_record['Volume'] = load_int(load_xml_text(journal.find("JournalIssue").find("Volume")))
-                pub_record['Issue'] = load_int(load_xml_text(journal.find("JournalIssue").find("Issue")))
-                pub_record['ISSN'] = load_html_str(load_xml_text(journal.find("ISSN")))
+        return pub2year, fieldinfo
 
-                history = article_bucket.find("PubmedData/History")
-                if not history is None:
-                    pdate = history.find('PubMedPubDate')
-                    if not pdate is None:
-                        pub_record['Year'] = load_int(load_xml_text(pdate.find("Year")))
-                        pub_record['Month'] = load_int(load_xml_text(pdate.find("Month")))
-                        pub_record['Day'] = load_int(load_xml_text(pdate.find("Day")))
+    def _preprocessed_files(self, path2df, file_prefix, xml_directory='RawXML', preprocess=True, rewrite_existing=False,
+        show_progress=True, num_workers=None, file_extension='.hdf'):
+        """
+        List the preprocessed files of one DataFrame type.
 
+        With preprocess, any xml files that were not parsed yet (or all of them, if rewrite_existing is True)
+        are first parsed by `preprocess`, which returns right away when every file is already done.
+        """
+        file_pattern = os.path.join(self.path2database, path2df, file_prefix + '*' + file_extension)
 
-                if pub_record['Year'] > 0:
-                    pub2year[PublicationId] = pub_record['Year']
+        if preprocess:
+            self.preprocess(xml_directory=xml_directory, show_progress=show_progress, rewrite_existing=rewrite_existing,
+                num_workers=num_workers)
 
-                article_ids = article_bucket.find("PubmedData/ArticleIdList")
-                if article_ids is not None:
-                    doi = article_ids.find('ArticleId[@IdType="doi"]')
-                    pub_record['Doi'] = load_xml_text(doi)
+        return sorted(glob.glob(file_pattern))
 
+    def preprocess(self, xml_directory = 'RawXML', process_name=True, num_file_lines=10**6, show_progress=True, rewrite_existing = False, num_workers=None):
+        """
+        Bulk preprocess of the PubMed raw data.
 
-                author_list = article.find('AuthorList')
+        Parameters
+        ----------
+        process_name: bool, default True
+            If True, then when processing the raw file, the package `NameParser <https://nameparser.readthedocs.io/en/latest/>`_
+            will be used to split author FullNames.
 
-                if not author_list is None:
-                    for seq, author in enumerate(author_list.findall('Author')):
-                        author_record = self._blank_pubmed_author()
+        num_file_lines: int, default 10**6
+            The processed data will be saved into smaller DataFrames, each with `num_file_lines` rows.
 
-                        author_record['PublicationId'] = PublicationId
-                        author_record['FirstName'] = load_html_str(load_xml_text(author.find("ForeName")))
-                        author_record['LastName'] = load_html_str(load_xml_text(author.find("LastName")))
-                        author_record['FullName'] = author_record['FirstName'] + ' ' + author_record['LastName']
+        show_progress: bool, default True
+            Show progress with processing of the data.
 
-                        if author.find("AffiliationInfo/Affiliation") is not None:
-                            author_record['Affiliations'] = load_html_str(load_xml_text(author.find("AffiliationInfo/Affiliation")))
-                            author_record['Affiliations'] = author_record['Affiliations'].replace("For a full list of the authors' affiliations please see the Acknowledgements section.","")
+        rewrite_existing: bool, default False
+            If True, rewrites the files in the data directory
 
-                        author_record['AuthorSequence'] = seq+1
+        num_workers: int, default None
+            The number of processes used to parse the xml files in parallel.  If None, use all available cpus.
+        """
 
-                        paa_df.append(author_record)
+        for hier_dir_type in [self.path2pub_df, self.path2paa_df, self.path2pub2field_df, self.path2pub2ref_df, self.path2fieldinfo_df]:
 
-                    pub_record['TeamSize'] = seq + 1
+            if not os.path.exists(os.path.join(self.path2database, hier_dir_type)):
+                os.mkdir(os.path.join(self.path2database, hier_dir_type))
 
-                meshterms = medline.find("MeshHeadingList")
+        fieldinfo_file_name = os.path.join(self.path2database, self.path2fieldinfo_df,'fieldinfo.hdf')
+        pub2year_file_name = os.path.join(self.path2database, 'pub2year.parquet')
 
-                if meshterms is not None:
-                    for term in meshterms.getchildren():
-                        ui = term.find("DescriptorName").attrib.get("UI", "")
-                        if len(ui)>0:
-                            pub2field_df.append([PublicationId, ui])
-                            fieldinfo[ui] = [load_xml_text(term.find("DescriptorName")), 'mesh']
+        # the field info and publication years are collected from all of the xml files, so they can only
+        # be rebuilt by parsing every file again
+        have_tables = os.path.isfile(fieldinfo_file_name) and os.path.isfile(pub2year_file_name)
+        tasks = self._xml_file_tasks(xml_directory, rewrite_existing=rewrite_existing or not have_tables)
 
-                chemicals = medline.find("ChemicalList")
-                if chemicals is not None:
-                    for chemical in chemicals.findall("Chemical"):
-                        ui = chemical.find("NameOfSubstance").attrib.get("UI", "")
-                        if len(ui)>0:
-                            pub2field_df.append([PublicationId, ui])
-                            fieldinfo[ui] = [load_xml_text(chemical.find("NameOfSubstance")), 'chem']
+        # all of the xml files were already parsed, so there is nothing left to do
+        if len(tasks) == 0:
+            return
 
-                references = article_bucket.find("PubmedData/ReferenceList")
-                if not references is None:
-                    for ref in references.findall("Reference"):
-                        citation = load_xml_text(ref.find("Citation"))
-                        if not ref.find('ArticleIdList') is None:
-                            pmid = load_int(load_xml_text(ref.find('ArticleIdList').find('ArticleId[@IdType="pubmed"]')))
-                        else:
-                            pmid = ""
-                        pub2ref_df.append([PublicationId, pmid, citation])
+        if show_progress:
+            print("Starting to preprocess the PubMed database.")
 
-                publication_df.append(pub_record)
+        pub2year, fieldinfo = self._process_xml_files(tasks, num_workers=num_workers, show_progress=show_progress)
 
-            self._save_dataframes(ifile, publication_df, paa_df, pub2ref_df, pub2field_df)
-            ifile += 1
+        # when only some of the xml files were parsed, add their results to the saved tables
+        if not rewrite_existing and os.path.isfile(fieldinfo_file_name):
+            old_fieldinfo = pd.read_hdf(fieldinfo_file_name)
+            for ui, name, fieldtype in zip(old_fieldinfo['FieldId'], old_fieldinfo['FieldName'], old_fieldinfo['FieldType']):
+                fieldinfo.setdefault(ui, (name, fieldtype))
 
-        # if rewriting
-        dest_file_name = os.path.join(self.path2database, self.path2fieldinfo,'fieldinfo.hdf')
-        if rewrite_existing:
-            # save field info dictionary
-            mesh_id_df_list = list(fieldinfo.values())
-            for i, j in enumerate(fieldinfo.keys()):
-                mesh_id_df_list[i].insert(0, j)
+        if not rewrite_existing and os.path.isfile(pub2year_file_name):
+            old_pub2year = pd.read_parquet(pub2year_file_name)
+            pub2year = {**dict(zip(old_pub2year['PublicationId'].tolist(), old_pub2year['Year'].tolist())), **pub2year}
 
-            fieldinfo = pd.DataFrame(mesh_id_df_list, columns = ['FieldId', 'FieldName', 'FieldType'], dtype=int)
-            fieldinfo.to_hdf( os.path.join(self.path2database, self.path2fieldinfo, 'fieldinfo.hdf'), key = 'fieldinfo', mode='w')
+        # save field info dictionary, ordered by FieldId
+        fieldinfo = pd.DataFrame([(ui, name, fieldtype) for ui, (name, fieldtype) in sorted(fieldinfo.items())],
+            columns = ['FieldId', 'FieldName', 'FieldType'])
+        _write_hdf(fieldinfo, fieldinfo_file_name, key = 'fieldinfo')
 
-        with gzip.open(os.path.join(self.path2database, 'pub2year.json.gz'), 'w') as outfile:
-            outfile.write(json.dumps(pub2year).encode('utf8'))
+        # save the year of each publication as a two column table
+        pub2year = pd.DataFrame({'PublicationId':np.fromiter(pub2year.keys(), dtype=np.int64, count=len(pub2year)),
+            'Year':np.fromiter(pub2year.values(), dtype=np.int16, count=len(pub2year))})
+        pub2year.to_parquet(pub2year_file_name, compression='zstd', index=False)
 
 
     def download_from_source(self, source_url='ftp.ncbi.nlm.nih.gov', dtd_url = 'https://dtd.nlm.nih.gov/ncbi/pubmed/out/pubmed_190101.dtd',
-        rewrite_existing = False, show_progress=True):
+        rewrite_existing = False, show_progress=True, num_connections=4):
         """
         Download the Pubmed raw xml files and the dtd formating information from [PubMed](https://www.nlm.nih.gov/databases/download/pubmed_medline.html).
             1. pubmed/baseline - the directory containing the baseline compressed xml files
@@ -273,12 +648,16 @@ class PubMed(BibDataBase):
         source_url: str, default 'ftp.ncbi.nlm.nih.gov'
             The base url for the ftp server from which to download.
 
-        dtd_url: str, default 'pubmed_190101.dtd'
-            The url for the dtd file.
+        dtd_url: str, default 'https://dtd.nlm.nih.gov/ncbi/pubmed/out/pubmed_190101.dtd'
+            The url for the dtd file.  It is saved under its own file name, so the xml files that reference
+            this dtd load it from the local copy when they are parsed.
 
         show_progress: bool, default True
             Show progress with processing of the data.
 
+        num_connections: int, default 4
+            The number of ftp sessions used to download the files concurrently.
+
         """
 
         FTP_USER = "anonymous"
@@ -297,27 +676,32 @@ class PubMed(BibDataBase):
             files_already_downloaded = os.listdir(os.path.join(self.path2database, 'RawXML'))
             files2download = [fname for fname in files2download if not fname in files_already_downloaded]
 
-        for xml_file_name in tqdm(files2download, disable=not show_progress):
-            with open(os.path.join(self.path2database, 'RawXML', xml_file_name), "wb") as outfile:
-                ftp.retrbinary('RETR %s' % xml_file_name, outfile.write)
+        ftp.quit()
 
-        with open(os.path.join(self.path2database, 'RawXML', 'pubmed_190101.dtd'), 'w') as outfile:
-            outfile.write(requests.get(dtd_url).content.decode('utf-8'))
+        # the files are split between several ftp sessions, each downloading in its own thread
+        num_connections = max(1, min(num_connections, len(files2download)))
+        with tqdm(total=len(files2download), disable=not show_progress) as pbar:
+            with ThreadPoolExecutor(max_workers=num_connections) as executor:
+                downloads = [executor.submit(_download_ftp_files, source_url, "pubmed/baseline/", files2download[i::num_connections],
+                    os.path.join(self.path2database, 'RawXML'), pbar) for i in range(num_connections)]
+                for download in downloads:
+                    download.result()
 
-        ftp.quit()
+        with open(os.path.join(self.path2database, 'RawXML', os.path.basename(dtd_url)), 'w') as outfile:
+            outfile.write(requests.get(dtd_url).content.decode('utf-8'))
 
 
     def parse_affiliations(self, preprocess = False):
         raise NotImplementedError("PubMed artciles are stored with all information in an xml file.  Run preprocess to parse the file.")
 
-    def parse_publications(self, xml_directory = 'RawXML',preprocess = True, num_file_lines=10**7,rewrite_existing = False):
+    def parse_publications(self, xml_directory = 'RawXML',preprocess = True, num_file_lines=10**7,rewrite_existing = False, show_progress=True, num_workers=None):
         """
         Parse the PubMed publication raw data.
         
         Parameters
         ----------
         preprocess: bool, default True
-            Save the processed data in new DataFrames.
+            If True, first parse (with `preprocess`) any raw xml files that were not preprocessed yet.
         process_name: bool, default True
             If True, then when processing the raw file, the package `NameParser <https://nameparser.readthedocs.io/en/latest/>`_
             will be used to split author FullNames.
@@ -325,6 +709,8 @@ class PubMed(BibDataBase):
             The processed data will be saved into smaller DataFrames, each with `num_file_lines` rows.
         show_progress: bool, default True
             Show progress with processing of the data.
+        num_workers: int, default None
+            The number of processes used to parse the xml files in parallel.  If None, use all available cpus.
         
         Returns
         ----------
@@ -332,106 +718,22 @@ class PubMed(BibDataBase):
             Publication metadata DataFrame.
         """
 
-        # process publication files through xml
-        if preprocess:
-            if not os.path.exists(os.path.join(self.path2database, 'publication')):
-                os.mkdir(os.path.join(self.path2database, 'publication'))
-
-            xmlfiles = sorted([fname for fname in os.listdir(os.path.join(self.path2database, xml_directory)) if '.xml' in fname])
-
-            # read dtd - this takes
-            path2database = self.path2database # remove self to use inside of this class
-            class DTDResolver(etree.Resolver):
-                def resolve(self, system_url, public_id, context):
-                    return self.resolve_filename(os.path.join(path2database, system_url), context)
-
-            parser = etree.XMLParser(load_dtd=True, resolve_entities=True)
-
-            ifile = 0
-            for xml_file_name in tqdm(xmlfiles, desc='PubMed publication xml files', leave=True, disable=not show_progress):
-
-                # check if the xml file was already parsed
-                dest_file_name = os.path.join(self.path2database, self.path2paa_df,'publication{}.hdf'.format(ifile))
-                if not rewrite_existing and os.path.isfile(dest_file_name):
-                    ifile+=1
-                    continue
-
-                publication_df = []
-
-                all_pubmed_articles = xmltree.findall("/PubmedArticle")
-
-                for article_bucket in all_pubmed_articles:
-
-                    medline = article_bucket.find("MedlineCitation")
-
-                    # scrape the publication information
-                    PublicationId = load_int(load_xml_text(medline.find('PMID')))
-
-                    pub_record = self._blank_pubmed_publication(PublicationId)
-
-                    article = medline.find("Article")
-                    pub_record['Title'] = load_html_str(load_xml_text(article.find('ArticleTitle')))
-                    if article.find('Pagination') == None:
-                        pub_record['Pages'] = None
-                    else:
-                        pub_record['Pages'] = load_html_str(load_xml_text(article.find('Pagination').find("MedlinePgn")))
-
-                    journal = article.find("Journal")
-                    pub_record['JournalId'] = load_html_str(load_xml_text(journal.find("Title")))
-                    pub_record['Volume'] = load_int(load_xml_text(journal.find("JournalIssue").find("Volume")))
-                    pub_record['Issue'] = load_int(load_xml_text(journal.find("JournalIssue").find("Issue")))
-                    pub_record['ISSN'] = load_html_str(load_xml_text(journal.find("ISSN")))
-
-                    history = article_bucket.find("PubmedData/History")
-                    if not history is None:
-                        pdate = history.find('PubMedPubDate')
-                        if not pdate is None:
-                            pub_record['Year'] = load_int(load_xml_text(pdate.find("Year")))
-                            pub_record['Month'] = load_int(load_xml_text(pdate.find("Month")))
-                            pub_record['Day'] = load_int(load_xml_text(pdate.find("Day")))
-
-                    article_ids = article_bucket.find("PubmedData/ArticleIdList")
-                    if article_ids is not None:
-                        doi = article_ids.find('ArticleId[@IdType="doi"]')
-                        pub_record['Doi'] = load_xml_text(doi)
-
-
-                    author_list = article.find('AuthorList')
-
-                    if not author_list is None:
-                        pub_record['TeamSize'] = len(author_list.findall('Author'))
-
-                    publication_df.append(pub_record)
-
-                # save publication dataframe
-                publication_df = pd.DataFrame(publication_df)
-                publication_df['PublicationId'] = publication_df['PublicationId'].astype(int)
-                publication_df['Year'] = publication_df['Year'].astype(int)
-                publication_df['Month'] = publication_df['Month'].astype(int)
-                publication_df['Day'] = publication_df['Day'].astype(int)
-                publication_df['Volume'] = pd.to_numeric(publication_df['Volume'])
-                publication_df['TeamSize'] = publication_df['TeamSize'].astype(int)
-                publication_df.to_hdf( os.path.join(self.path2database, self.path2pub_df, 'publication{}.hdf'.format(ifile)), key = 'pub', mode='w')
-
-        ## load publication dataframe into a large file
-        pub_files_list = glob.glob(os.path.join(self.path2database, self.path2pub_df) + 'publication*.hdf')
-
-        pub_df = pd.DataFrame()
+        pub_files_list = self._preprocessed_files(self.path2pub_df, 'publication', xml_directory=xml_directory, preprocess=preprocess,
+            rewrite_existing=rewrite_existing, show_progress=show_progress, num_workers=num_workers)
 
         print("Parsing files...")
-        for tmp_pub_df in tqdm(paa_files_list, desc='PubMed author files', leave=True, disable=not show_progress):
-            pub_df = pub_df.append(pd.read_hdf(tmp_pub_df), ignore_index = True)
+        pub_df = _concat_hdf_files(pub_files_list, desc='PubMed publication files', show_progress=show_progress)
 
         return pub_df
 
-    def parse_references(self, xml_directory='RawXML',preprocess = True, num_file_lines=10**7, rewrite_existing=False,show_progress=True):
+    def parse_references(self, xml_directory='RawXML',preprocess = True, num_file_lines=10**7, rewrite_existing=False,show_progress=True, num_workers=None):
         """
         Parse the PubMed References raw data.
         
         Parameters
         ----------
         preprocess: bool, default True
-            Save the processed data in new DataFrames.
+            If True, first parse (with `preprocess`) any raw xml files that were not preprocessed yet.
         process_name: bool, default True
             If True, then when processing the raw file, the package `NameParser <https://nameparser.readthedocs.io/en/latest/>`_
             will be used to split author FullNames.
@@ -439,6 +741,8 @@ class PubMed(BibDataBase):
             The processed data will be saved into smaller DataFrames, each with `num_file_lines` rows.
         show_progress: bool, default True
             Show progress with processing of the data.
+        num_workers: int, default None
+            The number of processes used to parse the xml files in parallel.  If None, use all available cpus.
         
         Returns
         ----------
@@ -446,79 +750,25 @@ class PubMed(BibDataBase):
             Citations DataFrame.
         """
 
-        # process author files through xml
-        if preprocess:
-            if not os.path.exists(os.path.join(self.path2database, 'pub2ref')):
-                os.mkdir(os.path.join(self.path2database, 'pub2ref'))
-
-            xmlfiles = sorted([fname for fname in os.listdir(os.path.join(self.path2database, xml_directory)) if '.xml' in fname])
-
-            # read dtd - this takes
-            path2database = self.path2database # remove self to use inside of this class
-            class DTDResolver(etree.Resolver):
-                def resolve(self, system_url, public_id, context):
-                    return self.resolve_filename(os.path.join(path2database, system_url), context)
-
-            parser = etree.XMLParser(load_dtd=True, resolve_entities=True)
-
-            ifile = 0
-            for xml_file_name in tqdm(xmlfiles, desc='PubMed reference xml files', leave=True, disable=not show_progress):
-
-                xmltree = etree.parse(os.path.join(self.path2database, xml_directory, xml_file_name), parser)
-
-                # check if the xml file was already parsed
-                dest_file_name = os.path.join(self.path2database, self.path2pub2ref_df,'pub2ref{}.hdf'.format(ifile))
-                if not rewrite_existing and os.path.isfile(dest_file_name):
-                    ifile+=1
-                    continue
-
-                pub2ref_df = []
-
-                all_pubmed_articles = xmltree.findall("/PubmedArticle")
-
-                for article_bucket in all_pubmed_articles:
-
-                    medline = article_bucket.find("MedlineCitation")
-
-                    # scrape the publication information
-                    PublicationId = load_int(load_xml_text(medline.find('PMID')))
-
-
-                    references = article_bucket.find("PubmedData/ReferenceList")
-                    if not references is None:
-                        for ref in references.findall("Reference"):
-                            citation = load_xml_text(ref.find("Citation"))
-                            if not ref.find('ArticleIdList') is None:
-                                pmid = load_int(load_xml_text(ref.find('ArticleIdList').find('ArticleId[@IdType="pubmed"]')))
-                            else:
-                                pmid = ""
-                            pub2ref_df.append([PublicationId, pmid, citation])
-
-                # save file
-                pub2ref_df = pd.DataFrame(pub2ref_df, columns = ['CitedPublicationId', 'CitingPublicationId', 'Citation'], dtype=int)
-                pub2ref_df.to_hdf( os.path.join(self.path2database, self.path2pub2ref_df, 'pub2ref{}.hdf'.format(ifile)), key = 'pub2ref', mode='w')
-
-
         # load the citations into a large dataframe
-
-        pub2ref_files = glob.glob(os.path.join(self.path2database, self.path2pub2ref_df)+ 'pub2ref*.hdf')
-
-        pub2ref_df = pd.DataFrame()
+        pub2ref_files = self._preprocessed_files(self.path2pub2ref_df, 'pub2ref', xml_directory=xml_directory, preprocess=preprocess,
+            rewrite_existing=rewrite_existing, show_progress=show_progress, num_workers=num_workers, file_extension='.parquet')
 
         print("parsing citation data...")
-        for pub2ref_tmp in tqdm(pub2ref_files,desc='PubMed citation xml files', leave=True, disable=not show_progress):
-            pub2ref_df = pub2ref_df.append(pd.read_hdf(pub2ref_tmp), ignore_indexTrue)
+        # the citation text is read straight into arrow string buffers, as in load_references; the cited ids
+        # stay float, so the missing ids are NaN and the usual isin_sorted filters work on them
+        pub2ref_df = _concat_parquet_files(pub2ref_files, _PUB2REF_COLUMNS, desc='PubMed citation files', show_progress=show_progress)
 
         return pub2ref_df
 
-    def parse_publicationauthoraffiliation(self, xml_directory = 'RawXML',preprocess = True, num_file_lines=10**7, rewrite_existing = False):
+    def parse_publicationauthoraffiliation(self, xml_directory = 'RawXML',preprocess = True, num_file_lines=10**7, rewrite_existing = False, show_progress=True, num_workers=None):
         """
         Parse the PubMed publication-author raw data.
         
         Parameters
         ----------
         preprocess: bool, default True
-            Save the processed data in new DataFrames.
+            If True, first parse (with `preprocess`) any raw xml files that were not preprocessed yet.
         process_name: bool, default True
             If True, then when processing the raw file, the package `NameParser <https://nameparser.readthedocs.io/en/latest/>`_
             will be used to split author FullNames.
@@ -526,6 +776,8 @@ class PubMed(BibDataBase):
             The processed data will be saved into smaller DataFrames, each with `num_file_lines` rows.
         show_progress: bool, default True
             Show progress with processing of the data.
+        num_workers: int, default None
+            The number of processes used to parse the xml files in parallel.  If None, use all available cpus.
        
         Returns
         ----------
@@ -533,83 +785,24 @@ class PubMed(BibDataBase):
             Publication-Author DataFrame.
         """
 
-        # process author files through xml
-        if preprocess:
-            if not os.path.exists(os.path.join(self.path2database, 'publicationauthoraffiliation')):
-                os.mkdir(os.path.join(self.path2database, 'publicationauthoraffiliation'))
-
-            xmlfiles = sorted([fname for fname in os.listdir(os.path.join(self.path2database, xml_directory)) if '.xml' in fname])
-
-            # read dtd - this takes
-            path2database = self.path2database # remove self to use inside of this class
-            class DTDResolver(etree.Resolver):
-                def resolve(self, system_url, public_id, context):
-                    return self.resolve_filename(os.path.join(path2database, system_url), context)
-
-            parser = etree.XMLParser(load_dtd=True, resolve_entities=True)
-
-            ifile = 0
-            for xml_file_name in tqdm(xmlfiles, desc='PubMed author xml files', leave=True, disable=not show_progress):
-
-                # check if the xml file was already parsed
-                dest_file_name = os.path.join(self.path2database, self.path2paa_df,'publicationauthoraffiliation{}.hdf'.format(ifile))
-                if not rewrite_existing and os.path.isfile(dest_file_name):
-                    ifile+=1
-                    continue
-
-                paa_df = []
-
-                all_pubmed_articles = xmltree.findall("/PubmedArticle")
-
-                for article_bucket in all_pubmed_articles:
-
-                    medline = article_bucket.find("MedlineCitation")
-
-                    # scrape the publication information
-                    PublicationId = load_int(load_xml_text(medline.find('PMID')))
-
-                    author_list = article.find('AuthorList')
-
-                    if not author_list is None:
-                        for seq, author in enumerate(author_list.findall('Author')):
-                            author_record = self._blank_pubmed_author()
-
-                            author_record['PublicationId'] = PublicationId
-                            author_record['FirstName'] = load_html_str(load_xml_text(author.find("ForeName")))
-                            author_record['LastName'] = load_html_str(load_xml_text(author.find("LastName")))
-                            author_record['FullName'] = author_record['FirstName'] + ' ' + author_record['LastName']
-
-                            if author.find("AffiliationInfo/Affiliation") is not None:
-                                author_record['Affiliations'] = load_html_str(load_xml_text(author.find("AffiliationInfo/Affiliation")))
-                                author_record['Affiliations'] = author_record['Affiliations'].replace("For a full list of the authors' affiliations please see the Acknowledgements section.","")
-
-                            author_record['AuthorSequence'] = seq+1
-
-                            paa_df.append(author_record)
-                paa_df = pd.DataFrame(paa_df)
-            paa_df['AuthorSequence'] = paa_df['AuthorSequence'].astype(int)
-            paa_df.to_hdf( os.path.join(self.path2database, self.path2paa_df, 'publicationauthoraffiliation{}.hdf'.format(ifile)), key = 'paa', mode='w')
-
-
         ## load publication author dataframe into a large file
-        paa_files_list = glob.glob(os.path.join(self.path2database, self.path2paa_df) + 'publicationauthoraffiliation*.hdf')
-
-        paa_df = pd.DataFrame()
+        paa_files_list = self._preprocessed_files(self.path2paa_df, 'publicationauthoraffiliation', xml_directory=xml_directory,
+            preprocess=preprocess, rewrite_existing=rewrite_existing, show_progress=show_progress, num_workers=num_workers,
+            file_extension='.parquet')
 
         print("Parsing files...")
-        for tmp_paa_df in tqdm(paa_files_list, desc='PubMed author files', leave=True, disable=not show_progress):
-            paa_df = paa_df.append(pd.read_hdf(tmp_paa_df), ignore_index = True)
+        paa_df = _concat_parquet_files(paa_files_list, _PAA_COLUMNS, desc='PubMed author files', show_progress=show_progress)
 
         return paa_df
 
-    def parse_fields(self, preprocess = True, num_file_lines=10**7, rewrite_existing=False,xml_directory = 'RawXML'):
+    def parse_fields(self, preprocess = True, num_file_lines=10**7, rewrite_existing=False,xml_directory = 'RawXML', show_progress=True, num_workers=None):
         """
         Parse the PubMed field (mesh term) raw data.
         
         Parameters
         ----------
         preprocess: bool, default True
-            Save the processed data in new DataFrames.
+            If True, first parse (with `preprocess`) any raw xml files that were not preprocessed yet.
         process_name: bool, default True
             If True, then when processing the raw file, the package `NameParser <https://nameparser.readthedocs.io/en/latest/>`_
             will be used to split author FullNames.
@@ -617,6 +810,8 @@ class PubMed(BibDataBase):
             The processed data will be saved into smaller DataFrames, each with `num_file_lines` rows.
         show_progress: bool, default True
             Show progress with processing of the data.
+        num_workers: int, default None
+            The number of processes used to parse the xml files in parallel.  If None, use all available cpus.
         
         Returns
         ----------
@@ -624,84 +819,20 @@ class PubMed(BibDataBase):
             Publication-Term ID DataFrame and Term ID - Term DataFrame
         """
 
-        if preprocess:
-            for hier_dir_type in [self.path2pub2field_df, self.path2fieldinfo_df]:
-                if not os.path.exists(os.path.join(self.path2database, hier_dir_type)):
-                    os.mkdir(os.path.join(self.path2database, hier_dir_type))
-
-            xmlfiles = sorted([fname for fname in os.listdir(os.path.join(self.path2database, xml_directory)) if '.xml' in fname])
-
-            # read dtd - this takes
-            path2database = self.path2database # remove self to use inside of this class
-            class DTDResolver(etree.Resolver):
-                def resolve(self, system_url, public_id, context):
-                    return self.resolve_filename(os.path.join(path2database, system_url), context)
-            parser = etree.XMLParser(load_dtd=True, resolve_entities=True)
-
-            # global id to term mapping
-            fieldinfo = {}
-
-            ifile = 0
-            for xml_file_name in tqdm(xmlfiles, desc='PubMed xml files', leave=True, disable=not show_progress):
-
-                # check if the xml file was already parsed
-                dest_file_name = os.path.join(self.path2database, self.path2pub2field_df,'pub2field{}.hdf'.format(ifile))
-                if not rewrite_existing and os.path.isfile(dest_file_name):
-                    ifile+=1
-                    continue
-
-                pub2field_df = []
-                all_pubmed_articles = xmltree.findall("/PubmedArticle")
-
-                for article_bucket in all_pubmed_articles:
-
-                    medline = article_bucket.find("MedlineCitation")
-
-                    # scrape the publication information
-                    PublicationId = load_int(load_xml_text(medline.find('PMID')))
-
-                    meshterms = medline.find("MeshHeadingList")
-
-                    if meshterms is not None:
-                        for term in meshterms.getchildren():
-                            ui = term.find("DescriptorName").attrib.get("UI", "")
-                            if len(ui)>0:
-                                pub2field_df.append([PublicationId, ui])
-                                fieldinfo[ui] = [load_xml_text(term.find("DescriptorName")), 'mesh']
-
-                    chemicals = medline.find("ChemicalList")
-                    if chemicals is not None:
-                        for chemical in chemicals.findall("Chemical"):
-                            ui = chemical.find("NameOfSubstance").attrib.get("UI", "")
-                            if len(ui)>0:
-                                pub2field_df.append([PublicationId, ui])
-                                fieldinfo[ui] = [load_xml_text(chemical.find("NameOfSubstance")), 'chem']
-
-                    # save the pub-field id
-                    pub2field_df = pd.DataFrame(pub2field_df, columns = ['PublicationId', 'FieldId'], dtype=int)
-                    pub2field_df.to_hdf( os.path.join(self.path2database, self.path2pub2field_df, 'pub2field{}.hdf'.format(ifile)), key = 'pub2field', mode='w')
-
-
-            # if rewriting
-            dest_file_name = os.path.join(self.path2database, self.path2fieldinfo,'fieldinfo.hdf')
-            if rewrite_existing:
-                # save field info dictionary
-                mesh_id_df_list = list(fieldinfo.values())
-                for i, j in enumerate(fieldinfo.keys()):
-                    mesh_id_df_list[i].insert(0, j)
-
-                fieldinfo = pd.DataFrame(mesh_id_df_list, columns = ['FieldId', 'FieldName', 'FieldType'], dtype=int)
-                fieldinfo.to_hdf( os.path.join(self.path2database, self.path2fieldinfo, 'fieldinfo.hdf'), key = 'fieldinfo', mode='w')
-
         # load the dataframes
-        # pub2field
-        pub2field_files = glob.glob(os.path.join(self.path2database, self.path2pub2field_df) + 'pub2field*.hdf')
-        pub2field_df = pd.DataFrame()
-
-        for pub2field_tmp_file in tqdm(pub2field_files, desc='PubMed pub2field files', leave=True, disable=not show_progress):
-            pub2field_df = pub2field_df.append(pd.read_hdf(pub2field_tmp_file), ignore_index=True)
+        # pub2field, along with the field info map written in the same pass
+        fieldinfo_file_name = os.path.join(self.path2database, self.path2fieldinfo_df, 'fieldinfo.hdf')
+        pub2field_files = self._preprocessed_files(self.path2pub2field_df, 'pub2field', xml_directory=xml_directory, preprocess=preprocess,
+            rewrite_existing=rewrite_existing, show_progress=show_progress, num_workers=num_workers, file_extension='.parquet')
 
         # field info map
-        fieldinfo_df = pd.read_hdf(os.path.join(self.path2database, self.path2fieldinfo, 'fieldinfo.hdf'))
+        fieldinfo_df = pd.read_hdf(fieldinfo_file_name)
+
+        # the FieldIds are stored as categories shared with the field info
+        field_dtype = pd.CategoricalDtype(fieldinfo_df['FieldId'].unique())
+        fieldinfo_df['FieldId'] = fieldinfo_df['FieldId'].astype(field_dtype)
+
+        pub2field_df = _concat_parquet_files(pub2field_files, _PUB2FIELD_COLUMNS, desc='PubMed pub2field files', show_progress=show_progress)
+        pub2field_df['FieldId'] = pub2field_df['FieldId'].astype(field_dtype)
 
         return pub2field_df, fieldinfo_df
@@ -109,7 +109,7 @@ def load_preprocessed_data(dataname, path2database, columns = None, filter_dict=
         filter_dict = {isinkey:np.sort(isinlist) for isinkey, isinlist in filter_dict.items()}
 
 
-    FileNumbers = sorted([int(fname.replace(dataname, '').split('.')[0]) for fname in os.listdir(path2files) if dataname in fname])
+    FileNumbers = sorted(set([int(fname.replace(dataname, '').split('.')[0]) for fname in os.listdir(path2files) if dataname in fname]))
 
     desc=''
     if isinstance(show_progress, str):
@@ -117,8 +117,13 @@ def load_preprocessed_data(dataname, path2database, columns = None, filter_dict=
 
     data_df = []
     for ifile in tqdm(FileNumbers, desc=desc, leave=True, disable=not show_progress):
-        fname = os.path.join(path2files, dataname+"{}.hdf".format(ifile))
-        subdf = pd.read_hdf(fname, mode = 'r')
+        # some sources save their DataFrames as parquet files instead of hdf
+        fname = os.path.join(path2files, dataname+"{}.parquet".format(ifile))
+        if os.path.isfile(fname):
+            subdf = pd.read_parquet(fname)
+        else:
+            fname = os.path.join(path2files, dataname+"{}.hdf".format(ifile))
+            subdf = pd.read_hdf(fname, mode = 'r')
 
         if callable(prefunc2apply):
             subdf = prefunc2apply(subdf)
@@ -131,7 +136,7 @@ def load_preprocessed_data(dataname, path2database, columns = None, filter_dict=
 
         if isinstance(filter_dict, dict):
             for isinkey, isinlist in filter_dict.items():
-                subdf = subdf[isin_sorted(subdf[isinkey], isinlist)]
+                subdf = subdf[isin_sorted(subdf[isinkey].values, isinlist)]
 
         if isinstance(duplicate_subset, list):
             subdf.drop_duplicates(subset = duplicate_subset, keep = duplicate_keep, inplace = True)
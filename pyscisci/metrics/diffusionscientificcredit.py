@@ -8,10 +8,11 @@
 
 import pandas as pd
 import numpy as np
+import scipy.sparse as spsparse
 
 from pyscisci.utils import isin_sorted, groupby_count, groupby_total
 from pyscisci.network import cocitation_network
-from pyscisci.sparsenetworkutils import dataframe2bipartite, sparse_pagerank_scipy
+from pyscisci.sparsenetworkutils import sparse_pagerank_scipy
 
 def diffusion_of_scientific_credit(pub2ref_df, pub2author_df, pub_df=None, alpha = 0.9, max_iter = 100, tol = 1.0e-10):
     """
@@ -67,42 +68,54 @@ def diffusion_of_scientific_credit(pub2ref_df, pub2author_df, pub_df=None, alpha
     """
 
     # relabel the authors to map to network nodes
-    focus_authors = np.sort(pub2author_df['AuthorId'].unique())
-    author2int = {aid:i for i, aid in enumerate(focus_authors)}
-    Nauthors = len(author2int)
-
     pub2author_df.drop_duplicates(subset=['PublicationId', 'AuthorId'], inplace=True)
-    pub2author_df['AuthorId'] = [author2int.get(aid, None) for aid in pub2author_df['AuthorId'].values]
+    pub2author_df['AuthorId'], focus_authors = pd.factorize(pub2author_df['AuthorId'].values, sort=True)
+    Nauthors = focus_authors.shape[0]
 
     # check if we are given the teamsize in publication information
     if (not pub_df is None) and 'TeamSize' in list(pub_df):
-        teamsize = {pid:ts for pid, ts in pub_df[['PublicationId', 'TeamSize']].values}
+        teamsize = pub_df.drop_duplicates(subset=['PublicationId'], keep='last').set_index('PublicationId')['TeamSize']
     
     # otherwies we need to calculate teamsize based on the authorship information
     else:
         teamsize = pub2author_df.groupby('PublicationId')['AuthorId'].nunique()
 
 
-    full_citation_df = pub2ref_df.merge(pub2author_df[['PublicationId', 'AuthorId']], left_on = 'CitingPublicationId', right_on = 'PublicationId')
-    del full_citation_df['PublicationId']
-    full_citation_df.rename(columns={'AuthorId':'CitingAuthorId'}, inplace=True)
-
-    full_citation_df = full_citation_df.merge(pub2author_df[['PublicationId', 'AuthorId']], left_on = 'CitedPublicationId', right_on = 'PublicationId')
-    del full_citation_df['PublicationId']
-    full_citation_df.rename(columns={'AuthorId':'CitedAuthorId'}, inplace=True)
+    # group the author codes by publication, so the authors of the i-th publication are
+    # pub_authors[pub_start[i]:pub_start[i] + pub_nauthors[i]]
+    order = np.argsort(pub2author_df['PublicationId'].values, kind='stable')
+    pub_authors = pub2author_df['AuthorId'].values[order]
+    pubids, pub_start, pub_nauthors = np.unique(pub2author_df['PublicationId'].values[order], return_index=True, return_counts=True)
 
-    full_citation_df.dropna(inplace=True)
+    # find the citing and cited publication of each citation, dropping those without authors
+    pubid_index = pd.Index(pubids)
+    citing = pubid_index.get_indexer(pub2ref_df['CitingPublicationId'].values)
+    cited = pubid_index.get_indexer(pub2ref_df['CitedPublicationId'].values)
+    has_authors = np.logical_and(citing >= 0, cited >= 0)
+    citing, cited = citing[has_authors], cited[has_authors]
 
     # now add in the teamsize information to make edge weights
-    full_citation_df['edge_weight'] = [1.0/(teamsize.get(citing_pid, 1) * teamsize.get(cited_pid, 1)) for citing_pid, cited_pid in full_citation_df[['CitingPublicationId', 'CitedPublicationId']].values]
+    citing_teamsize = teamsize.reindex(pubids[citing], fill_value=1).to_numpy()
+    cited_teamsize = teamsize.reindex(pubids[cited], fill_value=1).to_numpy()
+    edge_weight = 1.0/(citing_teamsize * cited_teamsize)
 
+    # each citation links every citing author to every cited author: expand the citations into
+    # these author pairs directly from the grouped author arrays, instead of merging twice
+    cited_nauthors = pub_nauthors[cited]
+    npairs = pub_nauthors[citing] * cited_nauthors
+    citation = np.repeat(np.arange(citing.shape[0]), npairs)
+    pair = np.arange(npairs.sum()) - np.repeat(np.cumsum(npairs) - npairs, npairs)
 
-    adj_mat = dataframe2bipartite(full_citation_df, rowname='CitingAuthorId', colname='CitedAuthorId', 
-        shape = (Nauthors,Nauthors), weightname = 'edge_weight')
+    citing_authors = pub_authors[pub_start[citing][citation] + pair // cited_nauthors[citation]]
+    cited_authors = pub_authors[pub_start[cited][citation] + pair % cited_nauthors[citation]]
+
+    adj_mat = spsparse.coo_matrix((np.repeat(edge_weight, npairs), (citing_authors, cited_authors)), shape = (Nauthors,Nauthors))
+    adj_mat.sum_duplicates()
+    adj_mat = adj_mat.tocsr()
 
 
     # make the weighted productivity vector to intialize the pagerank
-    pub2author_df['AuthorCredit'] = [1/teamsize.get(pid, 1) for pid in pub2author_df['PublicationId'].values]
+    pub2author_df['AuthorCredit'] = 1.0/teamsize.reindex(pub2author_df['PublicationId'].values, fill_value=1).to_numpy()
     weighted_productivity = groupby_total(pub2author_df, colgroupby = 'AuthorId', colcountby = 'AuthorCredit').sort_values('AuthorId')
     # norm vector
     weighted_productivity['AuthorCreditTotal'] = weighted_productivity['AuthorCreditTotal'] / weighted_productivity['AuthorCreditTotal'].sum()
@@ -113,4 +126,6 @@ def diffusion_of_scientific_credit(pub2ref_df, pub2author_df, pub_df=None, alpha
         initialization=weighted_productivity['AuthorCreditTotal'].values,
                    max_iter=max_iter, tol=tol, dangling=None)
 
+    author2int = dict(zip(focus_authors, range(Nauthors)))
+
     return sc, author2int
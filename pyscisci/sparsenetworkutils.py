@@ -123,7 +123,10 @@ def sparse_pagerank_scipy(adjmat, alpha=0.85, personalization=None, initializati
     out_strength[out_strength != 0] = 1.0 / out_strength[out_strength != 0]
     
     Q = spsparse.spdiags(out_strength.T, 0, *adjmat.shape, format='csr')
-    adjmat = Q * adjmat
+
+    # store the transpose of the normalized matrix in csr format, so each iteration is a
+    # single row-major sparse matrix-vector product
+    transition_T = (Q * adjmat).T.tocsr()
 
     # initial vector
     if initialization is None:
@@ -149,7 +152,7 @@ def sparse_pagerank_scipy(adjmat, alpha=0.85, personalization=None, initializati
     # power iteration: make up to max_iter iterations
     for _ in range(max_iter):
         xlast = x
-        x = alpha * (x * adjmat + sum(x[is_dangling]) * dangling_weights) + \
+        x = alpha * (transition_T @ x + x[is_dangling].sum() * dangling_weights) + \
             (1 - alpha) * p
         # check convergence, l1 norm
         err = absolute(x - xlast).sum()
@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+
+from pyscisci.metrics.diffusionscientificcredit import diffusion_of_scientific_credit
+
+
+def test_diffusion_of_scientific_credit():
+    pub2author_df = pd.DataFrame({'PublicationId':[1, 1, 2, 3, 3, 3], 'AuthorId':['a', 'b', 'c', 'a', 'c', 'd']})
+    # publication 4 has no authors, so its citation is dropped
+    pub2ref_df = pd.DataFrame({'CitingPublicationId':[1, 3, 2, 3, 1], 'CitedPublicationId':[2, 1, 3, 2, 4]})
+
+    credit, author2int = diffusion_of_scientific_credit(pub2ref_df, pub2author_df.copy())
+    assert author2int == {'a':0, 'b':1, 'c':2, 'd':3}
+    assert np.allclose(credit, [0.2283377471566819, 0.11942822500618114, 0.5433245056866365, 0.10890952215050075])
+
+    # the team sizes can also be given with the publications
+    pub_df = pd.DataFrame({'PublicationId':[1, 2, 3], 'TeamSize':[2, 1, 4]})
+    credit, author2int = diffusion_of_scientific_credit(pub2ref_df, pub2author_df.copy(), pub_df=pub_df)
+    assert np.allclose(credit, [0.22526893061637732, 0.11727483653907356, 0.5494621387672455, 0.10799409407730377])
@@ -0,0 +1,11 @@
+import numpy as np
+
+from pyscisci.datasource.PubMed import _parse_ints
+
+
+def test_parse_ints():
+    values = np.array(['42', '123456789012345678', '99999999999999999999', '', None, '12A', '-7', '0'], dtype=object)
+    assert _parse_ints(values).tolist() == [42, 123456789012345678, 0, 0, 0, 0, -7, 0]
+    # the default replaces the missing, malformed, oversized, and zero values
+    assert _parse_ints(values, default=1).tolist() == [42, 123456789012345678, 1, 1, 1, 1, -7, 1]
+    assert _parse_ints(np.array([], dtype=object), default=1).tolist() == []
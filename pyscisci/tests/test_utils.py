@@ -1,7 +1,23 @@
-from pyscisci.utils import load_int
+import numpy as np
+
+import pyscisci.utils
+from pyscisci.utils import load_int, isin_sorted
 
 
 def test_load_int():
     assert load_int(1) == 1
     assert load_int("") is None
     assert load_int("x") is None
+
+
+def test_isin_sorted():
+    masterlist = np.array([1, 3, 5])
+    assert isin_sorted(np.array([0, 1, 4, 5, 6]), masterlist).tolist() == [False, True, False, True, False]
+    assert isin_sorted(np.array(['a', 'c', 'z']), np.array(['a', 'b', 'c'])).tolist() == [True, True, False]
+    assert isin_sorted(np.array([1, 2]), np.array([], dtype=int)).tolist() == [False, False]
+
+
+def test_isin_sorted_without_numba(monkeypatch):
+    # the numpy search is used whenever numba is missing, so check it for numeric and empty input too
+    monkeypatch.setattr(pyscisci.utils, 'NUMBA_AVAILABLE', False)
+    test_isin_sorted()
@@ -5,16 +5,45 @@
 
 .. moduleauthor:: Alex Gates <ajgates42@gmail.com>
  """
-import sys
+import shutil
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import requests
 
-# determine if we are loading from a jupyter notebook (to make pretty progress bars)
-if 'ipykernel' in sys.modules:
-    from tqdm.notebook import tqdm
-else:
-    from tqdm import tqdm
+# numba is optional: when it is installed, the numeric helpers below run as single compiled loops
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _isin_sorted_numba(values2check, masterlist):
+        index = np.searchsorted(masterlist, values2check)
+        isin = np.empty(values2check.shape[0], dtype=np.bool_)
+        for i in range(values2check.shape[0]):
+            isin[i] = index[i] < masterlist.shape[0] and masterlist[index[i]] == values2check[i]
+        return isin
+
+    @njit(cache=True, error_model='numpy')
+    def _kl_numba(p, q):
+        total = 0.0
+        for i in range(p.shape[0]):
+            if p[i] > 0:
+                term = p[i]*np.log2(p[i]/q[i])
+                if not np.isnan(term):
+                    total += term
+        return -total
+
+def _is_numeric_vector(a):
+    return isinstance(a, np.ndarray) and a.ndim == 1 and a.dtype.kind in 'iuf'
+
+# The groupby helpers only produce groups for the observed keys.  A categorical colgroupby is grouped
+# directly by its codes, so when several helpers are applied to the same frame, converting the key
+# once with df[colgroupby].astype('category') avoids re-hashing it in every call.  Each helper is a
+# single vectorized aggregation, so they no longer display progress bars.
 
 def groupby_count(df, colgroupby, colcountby, count_unique=True, show_progress=False):
     """
@@ -35,7 +64,7 @@ def groupby_count(df, colgroupby, colcountby, count_unique=True, show_progress=F
         If True, count unique items in the rows.  If False, just return the number of rows.
 
     :param show_progress: bool or str, default False
-        If True, display a progress bar for the count.  If str, the name of the progress bar to display.
+        Unused; kept for backwards compatibility.
 
     Returns
     ----------
@@ -43,19 +72,12 @@ def groupby_count(df, colgroupby, colcountby, count_unique=True, show_progress=F
         DataFrame with two columns: colgroupby, colcountby+`Count`
     """
 
-    desc = ''
-    if isinstance(show_progress, str):
-        desc = show_progress
-    # register our pandas apply with tqdm for a progress bar
-    tqdm.pandas(desc=desc, disable= not show_progress)
-
-    newname_dict = zip2dict([str(colcountby), '0'], [str(colcountby)+'Count']*2)
     if count_unique:
-        count_df = df.groupby(colgroupby, sort=False)[colcountby].progress_apply(lambda x: x.nunique())
+        count_df = df.groupby(colgroupby, sort=False, observed=True)[colcountby].nunique()
     else:
-        count_df = df.groupby(colgroupby, sort=False)[colcountby].progress_apply(lambda x: x.shape[0])
+        count_df = df.groupby(colgroupby, sort=False, observed=True)[colcountby].size()
 
-    return count_df.to_frame().reset_index().rename(columns=newname_dict)
+    return count_df.to_frame(name=str(colcountby)+'Count').reset_index()
 
 def groupby_range(df, colgroupby, colrange, show_progress=False):
     """
@@ -73,21 +95,15 @@ def groupby_range(df, colgroupby, colrange, show_progress=False):
         The column to find the range of values.
 
     :param show_progress: bool or str, default False
-        If True, display a progress bar for the range.  If str, the name of the progress bar to display.
+        Unused; kept for backwards compatibility.
 
     Returns
     ----------
     DataFrame
         DataFrame with two columns: colgroupby, colrange+`Range`
     """
-    desc = ''
-    if isinstance(show_progress, str):
-        desc = show_progress
-    # register our pandas apply with tqdm for a progress bar
-    tqdm.pandas(desc=desc, disable= not show_progress)
-
-    newname_dict = zip2dict([str(colrange), '0'], [str(colrange)+'Range']*2)
-    return df.groupby(colgroupby, sort=False)[colrange].progress_apply(lambda x: x.max() - x.min()).to_frame().reset_index().rename(columns=newname_dict)
+    grouped = df.groupby(colgroupby, sort=False, observed=True)[colrange]
+    return (grouped.max() - grouped.min()).to_frame(name=str(colrange)+'Range').reset_index()
 
 def groupby_zero_col(df, colgroupby, colrange, show_progress=False):
     """
@@ -105,20 +121,14 @@ def groupby_zero_col(df, colgroupby, colrange, show_progress=False):
         The column to find the range of values.
 
     :param show_progress: bool or str, default False
-        If True, display a progress bar.  If str, the name of the progress bar to display.
+        Unused; kept for backwards compatibility.
 
     Returns
     ----------
     DataFrame
         DataFrame with two columns: colgroupby, colrange
     """
-    desc = ''
-    if isinstance(show_progress, str):
-        desc = show_progress
-    # register our pandas apply with tqdm for a progress bar
-    tqdm.pandas(desc=desc, disable= not show_progress)
-
-    return df.groupby(colgroupby, sort=False)[colrange].progress_transform(lambda x: x - x.min())
+    return df[colrange] - df.groupby(colgroupby, sort=False, observed=True)[colrange].transform('min')
 
 def groupby_total(df, colgroupby, colcountby, show_progress=False):
     """
@@ -136,21 +146,14 @@ def groupby_total(df, colgroupby, colcountby, show_progress=False):
         The column to find the total of values.
 
     :param show_progress: bool or str, default False
-        If True, display a progress bar for the summation.  If str, the name of the progress bar to display.
+        Unused; kept for backwards compatibility.
 
     Returns
     ----------
     DataFrame
         DataFrame with two columns: colgroupby, colcountby+'Total'
     """
-    desc = ''
-    if isinstance(show_progress, str):
-        desc = show_progress
-    # register our pandas apply with tqdm for a progress bar
-    tqdm.pandas(desc=desc, disable= not show_progress)
-
-    newname_dict = zip2dict([str(colcountby), '0'], [str(colcountby)+'Total']*2)
-    return df.groupby(colgroupby, sort=False)[colcountby].progress_apply(lambda x: x.sum()).to_frame().reset_index().rename(columns=newname_dict)
+    return df.groupby(colgroupby, sort=False, observed=True)[colcountby].sum().to_frame(name=str(colcountby)+'Total').reset_index()
 
 def groupby_mean(df, colgroupby, colcountby, show_progress=False):
     """
@@ -168,21 +171,14 @@ def groupby_mean(df, colgroupby, colcountby, show_progress=False):
         The column to find the mean of values.
 
     :param show_progress: bool or str, default False
-        If True, display a progress bar for the summation.  If str, the name of the progress bar to display.
+        Unused; kept for backwards compatibility.
 
     Returns
     ----------
     DataFrame
         DataFrame with two columns: colgroupby, colcountby+'Mean'
     """
-    desc = ''
-    if isinstance(show_progress, str):
-        desc = show_progress
-    # register our pandas apply with tqdm for a progress bar
-    tqdm.pandas(desc=desc, disable= not show_progress)
-
-    newname_dict = zip2dict([str(colcountby), '0'], [str(colcountby)+'Mean']*2)
-    return df.groupby(colgroupby, sort=False)[colrange].progress_apply(lambda x: x.mean()).to_frame().reset_index().rename(columns=newname_dict)
+    return df.groupby(colgroupby, sort=False, observed=True)[colcountby].mean().to_frame(name=str(colcountby)+'Mean').reset_index()
 
 def isin_range(values2check, min_value, max_value):
     """
@@ -226,9 +222,16 @@ def isin_sorted(values2check, masterlist):
     Numpy Array
         True if the value is in the masterlist.
     """
+    if NUMBA_AVAILABLE and _is_numeric_vector(values2check) and _is_numeric_vector(masterlist):
+        return _isin_sorted_numba(values2check, masterlist)
+
     index = np.searchsorted(masterlist, values2check, side = 'left')
-    index[index >= masterlist.shape[0]] = masterlist.shape[0] - 1
-    return values2check == masterlist[index]
+    if masterlist.shape[0] == 0:
+        return np.zeros(index.shape, dtype=bool)
+
+    # values past the end of the masterlist are compared against its first entry and then masked out
+    in_bounds = index < masterlist.shape[0]
+    return in_bounds & (values2check == masterlist[np.where(in_bounds, index, 0)])
 
 def argtopk(a, k=5):
     return np.argpartition(a, -k)[-k:][::-1]
@@ -260,33 +263,38 @@ def check4columns(df, column_list):
         if not col in list(df):
             print("Must pass column {0}".format(col))
 
+def _windows(a, window, step_size, nwindows):
+    # the windows start at consecutive positions and hold every step_size-th element along
+    # the last axis; limited to nwindows, but never read past the end of the array
+    span = (window - 1) * step_size + 1
+    if span > a.shape[-1]:
+        return np.empty(a.shape[:-1] + (0, window), dtype=a.dtype)
+    view = sliding_window_view(a, span, axis=-1)[..., ::step_size]
+    return view[..., :max(nwindows, 0), :]
+
 def rolling_window(a, window, step_size = 1):
-    shape = a.shape[:-1] + (a.shape[-1] - window + 1 - step_size, window)
-    strides = a.strides + (a.strides[-1] * step_size,)
-    return np.lib.stride_tricks.as_strided(a, shape=shape, strides=strides)
+    return _windows(a, window, step_size, a.shape[-1] - window + 1 - step_size)
 
 def forward_rolling_window(a, window, step_size = 1):
     a = np.pad(a.astype(float), (0,int(window)), 'constant', constant_values=(np.nan, np.nan))
-    shape = a.shape[:-1] + (a.shape[-1] - window + 1 - step_size, window)
-    strides = a.strides + (a.strides[-1] * step_size,)
-    return np.lib.stride_tricks.as_strided(a, shape=shape, strides=strides)
+    return _windows(a, window, step_size, a.shape[-1] - window + 1 - step_size)
 
 def hard_rolling_window(a, window, step_size = 1):
     a = np.pad(a.astype(float), (int((window - 1)/2),int((window - 1)/2) + 1), 'constant', constant_values=(np.nan, np.nan))
-    shape = a.shape[:-1] + (a.shape[-1] - window + 1 - step_size, window)
-    strides = a.strides + (a.strides[-1] * step_size,)
-    return  np.lib.stride_tricks.as_strided(a, shape=shape, strides=strides)
+    return _windows(a, window, step_size, a.shape[-1] - window + 1 - step_size)
 
 def past_window(a, window, step_size = 1):
     a = np.pad(a.astype(float), (window - 1, 0), 'constant', constant_values=(np.nan, np.nan))
-    shape = a.shape[:-1] + (a.shape[-1] - window + 2 - step_size, window)
-    strides = a.strides + (a.strides[-1] * step_size,)
-    return  np.lib.stride_tricks.as_strided(a, shape=shape, strides=strides)
+    return _windows(a, window, step_size, a.shape[-1] - window + 2 - step_size)
 
 def kl(p,q):
     """
     Kullback–Leibler divergence (KL-divergence)
     """
+    # the compiled loop does not check bounds, so vectors of different lengths are left to numpy
+    if NUMBA_AVAILABLE and _is_numeric_vector(p) and _is_numeric_vector(q) and p.shape == q.shape:
+        return _kl_numba(p, q)
+
     return -np.nansum(p[p>0]*np.log2(p[p>0]/q[p>0]))
 
 def jenson_shannon(p,q):
@@ -319,16 +327,20 @@ def rank_array(a, ascending=True, normed=False):
     Ranked array.
 
     """
-    idx = np.argsort(a)
-    ranks = np.empty_like(idx)
+    idx = np.argsort(a, kind='stable')
+    n = idx.shape[0]
+
+    # int32 ranks halve the memory traffic of the scatter for all but enormous arrays
+    rank_dtype = np.int32 if n < np.iinfo(np.int32).max else np.int64
+    ranks = np.empty(n, dtype=rank_dtype)
 
     if ascending:
-        ranks[idx] = np.arange(idx.shape[0])
+        ranks[idx] = np.arange(n, dtype=rank_dtype)
     else:
-        ranks[idx] = np.arange(idx.shape[0])[::-1]
+        ranks[idx] = np.arange(n - 1, -1, -1, dtype=rank_dtype)
 
     if normed:
-        ranks = ranks/(ranks.shape[0]-1)
+        ranks = ranks/(n-1)
     return ranks
 
 def holder_mean(a, rho=1):
@@ -363,26 +375,28 @@ def uniquemap_by_frequency(df, colgroupby='PublicationId', colcountby='FieldId',
         False: larger counts dominate--map defaults to the most common
         True: smaller counts dominate--map defaults to the least common
     """
-    countkeydict = {countid:i for i, countid in enumerate(df[colcountby].value_counts(ascending=ascending).index.values)}
-    def countkey(a):
-        if isinstance(a, pd.Series):
-            return [countkeydict[c] for c in a]
-        else:
-            return countkeydict[a]
-    return df.sort_values(by=[colcountby], key=countkey).drop_duplicates(subset=[colgroupby], keep='first')
+    # the position of each value in the frequency ordering becomes its sort key
+    countkey = df[colcountby].value_counts(ascending=ascending)
+    countkey = pd.Series(np.arange(countkey.shape[0]), index=countkey.index)
+
+    sortorder = np.argsort(df[colcountby].map(countkey).values, kind='stable')
+    return df.iloc[sortorder].drop_duplicates(subset=[colgroupby], keep='first')
 
 
-def download_file_from_google_drive(file_id, destination=None):
+def download_file_from_google_drive(file_id, destination=None, session=None):
     """
     Download data files from the google Drive.
 
+    Pass the same requests `session` to download several files over one connection pool.
+
     Modified from: from https://stackoverflow.com/questions/38511444/python-download-files-from-google-drive-using-url
     """
-    CHUNK_SIZE = 32768
+    CHUNK_SIZE = 2**20
 
     URL = "https://docs.google.com/uc?export=download"
 
-    session = requests.Session()
+    if session is None:
+        session = requests.Session()
 
     response = session.get(URL, params = { 'id' : file_id }, stream = True)
     token = get_confirm_token(response)
@@ -394,10 +408,10 @@ def download_file_from_google_drive(file_id, destination=None):
     if destination is None:
         return response
     else:
+        # copy the raw stream in large blocks, still undoing any transfer encoding like iter_content did
+        response.raw.decode_content = True
         with open(destination, "wb") as f:
-            for chunk in response.iter_content(CHUNK_SIZE):
-                if chunk: # filter out keep-alive new chunks
-                    f.write(chunk)
+            shutil.copyfileobj(response.raw, f, length=CHUNK_SIZE)
         return None   
 
 def get_confirm_token(response):
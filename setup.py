@@ -24,7 +24,7 @@ setup(name=__package__,
       packages = find_packages(),
       install_requires=[
             'pandas',
-            'numpy',
+            'numpy>=1.20',
             'scipy',
             'scikit-learn',
             'nameparser',
@@ -32,7 +32,8 @@ setup(name=__package__,
             'requests',
             'unidecode',
             'tqdm',
-            'tables'
+            'tables',
+            'pyarrow'
       ],
       include_package_data=True,
       zip_safe=False